@@ -0,0 +1,182 @@
+import dataclasses
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+
+from src.generator.generator import Generator
+from src.generator.map.map import Map
+from src.generator.util.presets import SimplePreset
+
+SUFFIX = ".npz"
+TMP_SUFFIX = ".tmp"
+
+# temporary files older than this are left behind by crashed writers
+STALE_TMP_SECONDS = 60 * 60
+
+
+class MapCache:
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024) -> None:
+        """
+        Creates a content-addressed cache of generated maps in the given directory.
+        Several processes may share the same directory, entries are written atomically.
+        :param directory: The directory the entries are stored in. It is created if it does not exist.
+        :param max_bytes: The total size of all entries, above which the least recently used entries are evicted.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(preset: SimplePreset, seed: int, parameters: dict, version: int = Generator.VERSION) -> str:
+        """
+        Computes the cache key of a generation.
+        :param preset: The preset of the map.
+        :param seed: The seed the generator was created with.
+        :param parameters: The stage parameters of the generator.
+        :param version: The version of the generator.
+        :return: A hex digest identifying the generated map.
+        """
+        payload = json.dumps(
+            {
+                "preset": dataclasses.asdict(preset),
+                "seed": seed,
+                "parameters": parameters,
+                "version": version
+            },
+            sort_keys=True
+        )
+
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def path_of(self, key: str) -> str:
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def load(self, key: str, game_map: Map) -> bytes | None:
+        """
+        Loads a cached entry into the grid of a map and marks the entry as recently used.
+        :param key: The key of the entry.
+        :param game_map: The map whose grid is replaced by the cached grid.
+        :return: The cached PNG export, or None if the key is not cached or its entry is damaged.
+        """
+        path = self.path_of(key)
+
+        try:
+            with np.load(path) as entry:
+                grid = entry["grid"]
+                image = entry["image"].tobytes()
+            os.utime(path)
+            game_map.set_grid_values(grid)
+        except FileNotFoundError:
+            return None
+        except (zipfile.BadZipFile, ValueError, KeyError, EOFError):
+            # a damaged entry is a miss, remove it so it gets regenerated
+            self._unlink(path)
+            return None
+        except OSError:
+            # transient errors are a miss as well, but the entry may be fine for other workers
+            return None
+
+        return image
+
+    def store(self, key: str, game_map: Map) -> bytes:
+        """
+        Stores the grid of a map together with its PNG export, then evicts entries above the size limit.
+        :param key: The key of the entry.
+        :param game_map: The map to be cached.
+        :return: The PNG export of the map.
+        """
+        buffer = io.BytesIO()
+        game_map.get_image().save(buffer, format="PNG")
+        image = buffer.getvalue()
+
+        # write to a temporary file in the same directory, so the rename is atomic
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=TMP_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                np.savez_compressed(file, grid=game_map.get_grid_values(), image=np.frombuffer(image, dtype=np.uint8))
+            os.replace(tmp_path, self.path_of(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        self.evict()
+
+        return image
+
+    def evict(self) -> None:
+        """
+        Deletes stale temporary files, then the least recently used entries until the total size is within
+        `max_bytes`. Temporary files of running writers count towards the total but are never deleted.
+        """
+        entries = []
+        pending = 0
+        stale_before = time.time() - STALE_TMP_SECONDS
+
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            if entry.name.endswith(TMP_SUFFIX):
+                if stat.st_mtime < stale_before:
+                    self._unlink(entry.path)
+                else:
+                    pending += stat.st_size
+            elif entry.name.endswith(SUFFIX):
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = pending + sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._unlink(path)
+            total -= size
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def generate_cached(
+        preset: SimplePreset,
+        seed: int,
+        cache: MapCache,
+        generator: Generator | None = None
+) -> tuple[Map, bytes]:
+    """
+    Generates a map, or loads it from the cache if the same preset and seed were generated before.
+    :param preset: The preset of the map.
+    :param seed: The seed of the generator.
+    :param cache: The cache to be used.
+    :param generator: A generator of the same preset to be reset and reused, otherwise a new one is created.
+    :return: The map and its PNG export.
+    """
+    if generator:
+        if generator.preset != preset:
+            raise ValueError("The generator was created for a different preset.")
+        generator.reset(seed)
+    else:
+        generator = Generator(Map(preset), seed)
+
+    game_map = generator.map
+    key = cache.key(preset, seed, generator.stage_parameters())
+
+    image = cache.load(key, game_map)
+    if image is not None:
+        return game_map, image
+
+    generator.generate_from_graph()
+
+    return game_map, cache.store(key, game_map)
@@ -2,47 +2,147 @@ import random
 
 import numpy as np
 
+from concurrent.futures import Executor
 from noise import pnoise1
 from scipy.interpolate import interp1d
 from src.generator.graph.edge import Edge
 from src.generator.graph.graph import Graph
+from src.generator.graph.serializer import deserialize_maze
+from src.generator.graph.serializer import serialize_maze
 from src.generator.graph.vertex import Vertex
+from src.generator.hierarchy import hierarchical_path
+from src.generator.hierarchy import straight_path
 from src.generator.map.map import Map
 from src.generator.util.blocks import BlockType
+from src.generator.util.deadline import Deadline
+from src.generator.util.deadline import Degradation
 from src.generator.util.utilities import bresenham_line
 from src.generator.util.utilities import generate_widths
 from typing import Literal
 
 
 class Generator:
+    # bump whenever a change alters the generated output for the same preset and seed
+    VERSION = 4
+
+    # degradations applied to the painting once at most the given share of the time budget is left
+    DEGRADATION_THRESHOLDS = {
+        Degradation.REDUCED_SPLINE_SAMPLES: 0.5,
+        Degradation.NO_PERLIN: 0.25,
+        Degradation.STRAIGHT_EDGES: 0.1
+    }
+    REDUCED_SPLINE_SAMPLES = 2
+    FALLBACK_WIDTH = 2
+    STRAIGHT_WIDTH = 1
+
     graph: Graph
+    path: list[Edge]
 
-    def __init__(self, game_map: Map) -> None:
+    def __init__(self, game_map: Map, seed: int | None = None) -> None:
         self.map = game_map
         self.preset = game_map.preset
         self.spacing = game_map.preset.mesh_spacing
-
-    def generate_from_graph(self) -> None:
-        self.graph = Graph()
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.spline_samples = 5
+        self.graph = Graph(self.spacing)
+        self.path = []
+        self.deadline = Deadline()
+        self.degradations: list[Degradation] = []
+
+        # recycled across generations, see reset
+        self.lattice: list[tuple[int, int]] = []
+        self.mesh: list[Vertex] = []
+
+    def stage_parameters(self) -> dict:
+        return {"spline_samples": self.spline_samples}
+
+    def reset(self, seed: int | None = None) -> None:
+        # prepares the next generation of the same preset, reusing the map grid and the mesh vertices.
+        # vertices of the previous graph and path are recycled, so they must not be used afterwards.
+        self.seed = seed
+        self.path = []
+        self.map.reset()
+
+    def generate_from_graph(self, deadline: Deadline | None = None) -> list[Degradation]:
+        self.start_generation(deadline)
 
         self.create_vertex_mesh()
         self.connect_graph_random()
         self.find_path()
         self.paint_smooth_path()
 
+        return self.degradations
+
+    def generate_hierarchical(
+            self,
+            factor: int,
+            executor: Executor | None = None,
+            deadline: Deadline | None = None
+    ) -> list[Degradation]:
+        self.start_generation(deadline)
+
+        self.connect_path_hierarchical(factor, executor)
+        self.paint_smooth_path()
+
+        return self.degradations
+
+    def start_generation(self, deadline: Deadline | None) -> None:
+        self.random.seed(self.seed)
+        self.graph.clear()
+        self.deadline = deadline or Deadline()
+        self.degradations = []
+
+    def degrade(self, degradation: Degradation) -> None:
+        if degradation not in self.degradations:
+            self.degradations.append(degradation)
+
+    def connect_path_hierarchical(self, factor: int, executor: Executor | None = None) -> None:
+        # only the path is generated, so the graph ends up like after find_path
+        cells, straight = hierarchical_path(
+            self.preset.mesh_size, factor, self.preset.start, self.preset.finish, self.random, executor, self.deadline
+        )
+
+        if straight:
+            self.degrade(Degradation.STRAIGHT_WALK)
+
+        vertices = [
+            Vertex(position_x + self.get_jitter(), position_y + self.get_jitter())
+            for position_x, position_y in (self.get_vertex_position(x, y) for x, y in cells)
+        ]
+        edges = [Edge(v_from, v_to) for v_from, v_to in zip(vertices, vertices[1:])]
+
+        self.graph.bulk_load(vertices, edges)
+        self.path = edges[::-1]
+
     def create_vertex_mesh(self) -> None:
         if not self.graph:
             return
 
-        mesh_size = self.preset.mesh_size + 1
+        if not self.lattice:
+            mesh_size = self.preset.mesh_size + 1
+
+            self.lattice = [(self.spacing * x, self.spacing * y)
+                            for x in range(1, mesh_size) for y in range(1, mesh_size)]
+            self.mesh = [Vertex(x, y) for x, y in self.lattice]
 
-        [self.graph.add_vertex(self.spacing * x, self.spacing * y)
-         for x in range(1, mesh_size) for y in range(1, mesh_size)]
+        # the vertices are reused, only their position and state are refreshed
+        for vertex, (x, y) in zip(self.mesh, self.lattice):
+            vertex.x = x + self.get_jitter()
+            vertex.y = y + self.get_jitter()
+            vertex.visited = False
+
+        self.graph.add_vertices(self.mesh)
+
+    def get_jitter(self) -> int:
+        jitter = self.preset.jitter
+        return self.random.randint(-jitter, jitter) if jitter else 0
 
     def connect_graph_random(self) -> None:
         self.graph.set_all_visited(False)
 
         v_start = self.get_vertex_at(self.preset.start[0], self.preset.start[1])
+        v_finish = self.get_vertex_at(*self.preset.finish)
 
         history = [v_start]
         current = history[0]
@@ -51,11 +151,22 @@ class Generator:
             if current is None:
                 break
 
+            self.deadline.check()
+
+            if v_finish is not None and self.deadline.expired():
+                if v_finish.visited:
+                    # the path to the finish cannot change anymore, the rest of the maze is pruned anyway
+                    self.degrade(Degradation.TRUNCATED_WALK)
+                else:
+                    self.degrade(Degradation.STRAIGHT_WALK)
+                    self.connect_straight(current, v_finish)
+                break
+
             current.visited = True
 
             neighbours = self.get_unvisited_neighbours(current)
             if neighbours:
-                next_vertex = random.choice(neighbours)
+                next_vertex = self.random.choice(neighbours)
 
                 edge = Edge(current, next_vertex)
                 self.graph.add_edge(edge)
@@ -67,24 +178,69 @@ class Generator:
                 if history:
                     current = history[-1]
 
+    def connect_straight(self, v_from: Vertex, v_to: Vertex) -> None:
+        # the fallback of an unfinished walk, edges already taken by the walk are kept
+        lattice_from, lattice_to = self.get_lattice_position(v_from), self.get_lattice_position(v_to)
+        cells = straight_path(
+            (lattice_from[0] // self.spacing - 1, lattice_from[1] // self.spacing - 1),
+            (lattice_to[0] // self.spacing - 1, lattice_to[1] // self.spacing - 1)
+        )
+
+        vertices = [self.get_vertex_at(x, y) for x, y in cells]
+
+        for current, next_vertex in zip(vertices, vertices[1:]):
+            edge = Edge(current, next_vertex)
+            if not self.graph.has_edge(edge):
+                self.graph.add_edge(edge)
+
     def find_path(self):
         v_start = self.get_vertex_at(*self.preset.start)
         v_finish = self.get_vertex_at(*self.preset.finish)
 
-        path = self.graph.dfs(v_start, v_finish)
+        path = self.graph.dfs(v_start, v_finish, self.deadline)
+        self.path = path
 
-        unreferenced_edges = [edge for edge in self.graph.edges.values() if edge not in path]
+        path_edges = set(path)
+        unreferenced_edges = [edge for edge in self.graph.edges.values() if edge not in path_edges]
 
         for edge in unreferenced_edges:
             if self.graph.has_edge(edge):
                 self.graph.delete_edge(edge)
 
+    def get_path_vertices(self) -> list[Vertex]:
+        # dfs returns the edges from finish to start, walk them backwards
+        current = self.get_vertex_at(*self.preset.start)
+        vertices = [current]
+
+        for edge in reversed(self.path):
+            current = edge.v_to if edge.v_from == current else edge.v_from
+            vertices.append(current)
+
+        return vertices
+
+    def serialize_maze(self) -> bytes:
+        path = self.get_path_vertices() if self.path else None
+        return serialize_maze(self.graph, self.preset.mesh_size, self.spacing, path)
+
+    def load_maze(self, data: bytes) -> None:
+        maze = deserialize_maze(data)
+
+        if (maze.mesh_size, maze.mesh_spacing) != (self.preset.mesh_size, self.spacing):
+            raise ValueError("The maze was serialized for a different mesh size or spacing.")
+
+        self.graph = maze.graph
+        self.path = [
+            self.graph.find_edge(v_from, v_to)
+            for v_from, v_to in zip(maze.path[::-1], maze.path[-2::-1])
+        ]
+
     def get_unvisited_neighbours(self, vertex: Vertex) -> list[Vertex]:
         neighbour_positions = [
             (-1, 0), (1, 0),  # left and right
             (0, -1), (0, 1)  # up and down
         ]
 
+        # neighbours are picked by lattice adjacency, so jittered mazes stay planar
         potential_neighbours = [
             self.get_vertex_by_offset(vertex, x, y)
             for x, y in neighbour_positions
@@ -101,10 +257,11 @@ class Generator:
 
     def get_vertex_by_offset(self, vertex: Vertex, offset_x: int, offset_y: int) -> Vertex | None:
         # Calculate the target vertex coordinates
-        target_x = vertex.x + self.spacing * offset_x
-        target_y = vertex.y + self.spacing * offset_y
+        lattice_x, lattice_y = self.get_lattice_position(vertex)
+        target_x = lattice_x + self.spacing * offset_x
+        target_y = lattice_y + self.spacing * offset_y
 
-        res = self.graph.vertex_at(target_x, target_y)
+        res = self.get_vertex_at_lattice(target_x, target_y)
 
         return res
 
@@ -113,10 +270,24 @@ class Generator:
         target_x = self.spacing * (mesh_x + 1)
         target_y = self.spacing * (mesh_y + 1)
 
-        res = self.graph.vertex_at(target_x, target_y)
+        res = self.get_vertex_at_lattice(target_x, target_y)
+
+        return res
+
+    def get_vertex_at_lattice(self, x: int, y: int) -> Vertex | None:
+        res = self.graph.vertex_at(x, y)
+
+        # a jittered vertex is within the jitter of its lattice position, on both axes
+        if res is None and self.preset.jitter:
+            candidates = self.graph.vertices_within(x, y, self.preset.jitter * 2)
+            res = next((v for v in candidates if self.get_lattice_position(v) == (x, y)), None)
 
         return res
 
+    def get_lattice_position(self, vertex: Vertex) -> tuple[int, int]:
+        # the jitter stays below half the spacing, so rounding recovers the lattice position
+        return round(vertex.x / self.spacing) * self.spacing, round(vertex.y / self.spacing) * self.spacing
+
     def get_vertex_position(self, mesh_x: int, mesh_y: int) -> tuple[int, int] | None:
         # Calculate the target vertex coordinates
         target_x = self.spacing * (mesh_x + 1)
@@ -227,7 +398,7 @@ class Generator:
 
         return result
 
-    def calculate_catmull_rom_splines(self) -> list[Vertex]:
+    def calculate_catmull_rom_splines(self, samples: int | None = None) -> list[Vertex]:
         vertices = [v for v in self.graph.adjacency.keys()]
 
         if len(vertices) < 4:
@@ -239,29 +410,63 @@ class Generator:
         interp_x = interp1d(t, x_vals, kind="cubic")
         interp_y = interp1d(t, y_vals, kind="cubic")
 
-        smooth_t = np.linspace(0, 1, len(vertices) * 5)
+        smooth_t = np.linspace(0, 1, len(vertices) * (samples or self.spline_samples))
         smooth_x = interp_x(smooth_t)
         smooth_y = interp_y(smooth_t)
 
         return [Vertex(int(x), int(y)) for x, y in zip(smooth_x, smooth_y)]
 
-    def paint_connected_vertices(self, vertices: list[Vertex]) -> None:
+    def paint_connected_vertices(self, vertices: list[Vertex], widths: list[int] | None = None) -> None:
         # generate different widths for every vertex
-        widths = generate_widths(len(vertices))
+        widths = widths or generate_widths(len(vertices), rng=self.random)
+        grid_size = self.map.grid_size
+        narrow = False
 
         for i in range(len(vertices) - 1):
+            self.deadline.check()
+
+            # out of time, finish the remaining segments with the cheapest brush
+            if not narrow and self.deadline.expired():
+                narrow = True
+                if Degradation.STRAIGHT_EDGES not in self.degradations:
+                    self.degrade(Degradation.NARROW_BRUSH)
+
             line_points = bresenham_line(vertices[i], vertices[i + 1])
 
-            width = widths[i]
+            width = self.STRAIGHT_WIDTH if narrow else widths[i]
 
             for x, y in line_points:
-                for dx in range(-width, width + 1):
-                    for dy in range(-width, width + 1):
-                        self.map.grid[y + dy][x + dx] = BlockType.EMPTY
+                # clip the brush, jitter and spline overshoot can reach the edges of the grid
+                for row in range(max(0, y - width), min(grid_size, y + width + 1)):
+                    for column in range(max(0, x - width), min(grid_size, x + width + 1)):
+                        self.map.grid[row][column] = BlockType.EMPTY
 
     def paint_smooth_path(self):
-        vertices = self.calculate_catmull_rom_splines()
-        self.paint_connected_vertices(vertices)
+        remaining = self.deadline.fraction_remaining()
+
+        if remaining <= self.DEGRADATION_THRESHOLDS[Degradation.STRAIGHT_EDGES]:
+            self.degrade(Degradation.STRAIGHT_EDGES)
+            self.paint_straight_path()
+            return
+
+        samples = self.spline_samples
+        if remaining <= self.DEGRADATION_THRESHOLDS[Degradation.REDUCED_SPLINE_SAMPLES]:
+            self.degrade(Degradation.REDUCED_SPLINE_SAMPLES)
+            samples = min(samples, self.REDUCED_SPLINE_SAMPLES)
+
+        vertices = self.calculate_catmull_rom_splines(samples)
+
+        widths = None
+        if remaining <= self.DEGRADATION_THRESHOLDS[Degradation.NO_PERLIN]:
+            self.degrade(Degradation.NO_PERLIN)
+            widths = [self.FALLBACK_WIDTH] * len(vertices)
+
+        self.paint_connected_vertices(vertices, widths)
+
+    def paint_straight_path(self):
+        # straight runs between the path vertices, like paint_edge but also for jittered meshes
+        vertices = list(self.graph.adjacency.keys())
+        self.paint_connected_vertices(vertices, [self.STRAIGHT_WIDTH] * len(vertices))
 
     @staticmethod
     def get_vertex_coordinates(vertex: Vertex) -> tuple[int, int]:
@@ -1,18 +1,22 @@
 from collections import defaultdict
 
 from src.generator.graph.edge import Edge
+from src.generator.graph.spatial_hash import SpatialHash
 from src.generator.graph.vertex import Vertex
+from src.generator.util.deadline import Deadline
 
 
 class Graph:
 
-    def __init__(self):
+    def __init__(self, cell_size: int = 16):
         """
         Creates an empty graph.
+        :param cell_size: The cell size of the spatial index, ideally close to the radius of neighbour queries.
         """
         self.vertices: dict[tuple[int, int], Vertex] = {}
         self.edges: dict[tuple[Vertex, Vertex], Edge] = {}
         self.adjacency: dict[Vertex, list[Vertex]] = defaultdict(list)
+        self.index = SpatialHash(cell_size)
 
     def vertex_at(self, x: int, y: int) -> Vertex | None:
         """
@@ -23,6 +27,26 @@ class Graph:
         """
         return self.vertices.get((x, y), None)
 
+    def vertices_within(self, x: int, y: int, radius: float) -> list[Vertex]:
+        """
+        Finds all vertices within a radius around the given coordinates.
+        :param x: The x coordinate of the center.
+        :param y: The y coordinate of the center.
+        :param radius: The radius, vertices exactly on the boundary are included.
+        :return: A list of vertices, or an empty list if there are none.
+        """
+        return self.index.query_radius(x, y, radius)
+
+    def nearest_vertices(self, x: int, y: int, k: int = 1) -> list[Vertex]:
+        """
+        Finds the vertices closest to the given coordinates.
+        :param x: The x coordinate.
+        :param y: The y coordinate.
+        :param k: The amount of vertices to be found.
+        :return: Up to k vertices, sorted by their distance.
+        """
+        return self.index.k_nearest(x, y, k)
+
     def has_vertex(self, vertex: Vertex) -> bool:
         """
         Checks whether the graph contains a vertex.
@@ -38,7 +62,18 @@ class Graph:
         :param y: The y coordinate of the vertex.
         """
         if not self.vertex_at(x, y):
-            self.vertices[(x, y)] = Vertex(x, y)
+            vertex = Vertex(x, y)
+            self.vertices[(x, y)] = vertex
+            self.index.insert(vertex)
+
+    def add_vertices(self, vertices: list[Vertex]) -> None:
+        """
+        Adds existing vertex objects to the graph without checking for duplicates.
+        :param vertices: The vertices to be added. Their coordinates must be unique and not yet part of the graph.
+        """
+        for vertex in vertices:
+            self.vertices[(vertex.x, vertex.y)] = vertex
+            self.index.insert(vertex)
 
     def delete_vertex(self, vertex: Vertex) -> None:
         """
@@ -48,7 +83,7 @@ class Graph:
         vertex_key = (vertex.x, vertex.y)
 
         if vertex_key in self.vertices:
-            del self.vertices[vertex_key]
+            self.index.remove(self.vertices.pop(vertex_key))
 
             if vertex in self.adjacency:
                 for neighbor in list(self.adjacency[vertex]):
@@ -92,6 +127,23 @@ class Graph:
         self.adjacency[edge.v_from].append(edge.v_to)
         self.adjacency[edge.v_to].append(edge.v_from)
 
+    def bulk_load(self, vertices: list[Vertex], edges: list[Edge]) -> None:
+        """
+        Adds vertices and edges to the graph without any of the checks of `add_vertex` and `add_edge`.
+        The vertices are registered in the adjacency in the given order, before any of the edges are added.
+        :param vertices: The vertices to be added. Every vertex referenced by `edges` must be included.
+        :param edges: The edges to be added. Each edge must be unique and connect two distinct vertices.
+        """
+        for vertex in vertices:
+            self.vertices[(vertex.x, vertex.y)] = vertex
+            self.adjacency[vertex] = []
+            self.index.insert(vertex)
+
+        for edge in edges:
+            self.edges[(edge.v_from, edge.v_to)] = edge
+            self.adjacency[edge.v_from].append(edge.v_to)
+            self.adjacency[edge.v_to].append(edge.v_from)
+
     def delete_edge(self, edge: Edge) -> None:
         """
         Deletes an edge from the graph and removes the edge's vertices, that are not referenced by any other edge.
@@ -149,6 +201,15 @@ class Graph:
         """
         return bool(self.adjacency.get(vertex, None))
 
+    def clear(self) -> None:
+        """
+        Removes all vertices and edges from the graph, so it can be reused.
+        """
+        self.vertices.clear()
+        self.edges.clear()
+        self.adjacency.clear()
+        self.index.clear()
+
     def set_all_visited(self, visited: bool) -> None:
         """
         Changes the `visited` value for every vertex in the graph.
@@ -169,8 +230,11 @@ class Graph:
 
         return True
 
-    def dfs(self, from_vertex: Vertex, to_vertex: Vertex) -> list[Edge] | None:
-        """Perform a depth-first search from `from_vertex` to `to_vertex` and return the path as a list of edges."""
+    def dfs(self, from_vertex: Vertex, to_vertex: Vertex, deadline: Deadline | None = None) -> list[Edge] | None:
+        """
+        Perform a depth-first search from `from_vertex` to `to_vertex` and return the path as a list of edges.
+        If a deadline is given, its cancellation is checked on every step.
+        """
         if not from_vertex or not to_vertex:
             return None
 
@@ -184,6 +248,9 @@ class Graph:
         next_vertex = None
 
         while current != to_vertex and stack:
+            if deadline:
+                deadline.check()
+
             current.visited = True
             if self.has_unvisited_neighbours(current):
                 neighbours = self.find_neighbours(current)
@@ -213,3 +280,4 @@ class Graph:
         for vertex in (edge.v_from, edge.v_to):
             if (vertex.x, vertex.y) not in self.vertices:
                 self.vertices[(vertex.x, vertex.y)] = vertex
+                self.index.insert(vertex)
@@ -0,0 +1,168 @@
+import struct
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.generator.graph.edge import Edge
+from src.generator.graph.graph import Graph
+from src.generator.graph.vertex import Vertex
+
+MAGIC = b"KMGM"
+VERSION = 1
+
+# magic, version, mesh size, mesh spacing, path start x, path start y, path length
+HEADER = struct.Struct("<4sBIIIII")
+
+# direction codes of the path stream, indexed by code
+DIRECTIONS: list[tuple[int, int]] = [
+    (1, 0),  # east
+    (0, 1),  # south
+    (-1, 0),  # west
+    (0, -1)  # north
+]
+
+
+@dataclass(frozen=True)
+class SerializedMaze:
+    graph: Graph
+    path: list[Vertex]
+    mesh_size: int
+    mesh_spacing: int
+
+
+def serialize_maze(graph: Graph, mesh_size: int, spacing: int, path: list[Vertex] | None = None) -> bytes:
+    """
+    Encodes a lattice maze as 2 bits per cell (east and south wall open) followed by the path as a direction stream.
+    :param graph: The graph to be encoded. Every edge must connect two neighbouring lattice vertices.
+    :param mesh_size: The amount of vertices per row and column of the lattice.
+    :param spacing: The distance between two neighbouring lattice vertices.
+    :param path: The ordered vertices of the path from start to finish, or None if there is no path.
+    :return: The encoded maze.
+    """
+    walls = np.zeros((mesh_size, mesh_size, 2), dtype=np.uint8)
+    path = path or []
+
+    _check_on_lattice(
+        np.array([(v.x, v.y) for e in graph.edges.values() for v in (e.v_from, e.v_to)] +
+                 [(v.x, v.y) for v in path], dtype=np.int64),
+        mesh_size,
+        spacing
+    )
+
+    if graph.edges:
+        coords = np.array(
+            [(e.v_from.x, e.v_from.y, e.v_to.x, e.v_to.y) for e in graph.edges.values()],
+            dtype=np.int64
+        ) // spacing - 1
+
+        low = np.minimum(coords[:, :2], coords[:, 2:])
+        delta = np.abs(coords[:, :2] - coords[:, 2:])
+
+        if np.any(delta.sum(axis=1) != 1):
+            raise ValueError("Only edges between neighbouring lattice vertices can be serialized.")
+
+        # delta is (1, 0) for an east wall and (0, 1) for a south wall
+        walls[low[:, 0], low[:, 1], delta[:, 1]] = 1
+
+    start_x, start_y = _to_mesh(path[0], spacing) if path else (0, 0)
+
+    codes = np.array(
+        [DIRECTIONS.index(_direction(a, b, spacing)) for a, b in zip(path, path[1:])],
+        dtype=np.uint8
+    )
+    code_bits = np.stack([codes >> 1, codes & 1], axis=1) if codes.size else np.zeros(0, dtype=np.uint8)
+
+    header = HEADER.pack(MAGIC, VERSION, mesh_size, spacing, start_x, start_y, len(path))
+
+    return header + np.packbits(walls.ravel()).tobytes() + np.packbits(code_bits.ravel()).tobytes()
+
+
+def deserialize_maze(data: bytes) -> SerializedMaze:
+    """
+    Rebuilds a maze encoded by `serialize_maze`. The vertices of the path are registered in path order, so that the
+    adjacency of the rebuilt graph iterates in the same order as the graph the path was found in.
+    :param data: The encoded maze.
+    :return: The rebuilt graph together with the path and the lattice dimensions.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Data is too short to be a serialized maze.")
+
+    magic, version, mesh_size, spacing, start_x, start_y, path_length = HEADER.unpack_from(data)
+
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Data is not a serialized maze of a supported version.")
+
+    if not spacing:
+        raise ValueError("Serialized maze has no mesh spacing, it is corrupted.")
+
+    wall_count = mesh_size * mesh_size * 2
+    wall_bytes = (wall_count + 7) // 8
+    code_count = max(0, path_length - 1) * 2
+
+    if len(data) != HEADER.size + wall_bytes + (code_count + 7) // 8:
+        raise ValueError("Serialized maze has an unexpected length, it is truncated or corrupted.")
+
+    buffer = np.frombuffer(data, dtype=np.uint8, offset=HEADER.size)
+    walls = np.unpackbits(buffer[:wall_bytes], count=wall_count).reshape(mesh_size, mesh_size, 2).astype(bool)
+    code_bits = np.unpackbits(buffer[wall_bytes:], count=code_count).reshape(-1, 2)
+    codes = (code_bits[:, 0] << 1) | code_bits[:, 1]
+
+    # walls of the last column and row would lead out of the mesh
+    if mesh_size and (walls[-1, :, 0].any() or walls[:, -1, 1].any()):
+        raise ValueError("Serialized maze has walls leading out of the mesh, it is corrupted.")
+
+    path_cells = [(start_x, start_y)] if path_length else []
+    for code in codes:
+        dx, dy = DIRECTIONS[code]
+        x, y = path_cells[-1]
+        path_cells.append((x + dx, y + dy))
+
+    if any(not (0 <= x < mesh_size and 0 <= y < mesh_size) for x, y in path_cells):
+        raise ValueError("Serialized maze has a path leaving the mesh, it is corrupted.")
+
+    for (from_x, from_y), (to_x, to_y) in zip(path_cells, path_cells[1:]):
+        if not walls[min(from_x, to_x), min(from_y, to_y), 1 if from_x == to_x else 0]:
+            raise ValueError("Serialized maze has a path crossing a closed wall, it is corrupted.")
+
+    east = np.argwhere(walls[:, :, 0])
+    south = np.argwhere(walls[:, :, 1])
+
+    referenced = walls[:, :, 0] | walls[:, :, 1]
+    referenced[1:, :] |= walls[:-1, :, 0]
+    referenced[:, 1:] |= walls[:, :-1, 1]
+    for x, y in path_cells:
+        referenced[x, y] = True
+
+    # path vertices come first, the remaining vertices follow in mesh order
+    on_path = set(path_cells)
+    cells = path_cells + [(x, y) for x, y in np.argwhere(referenced).tolist() if (x, y) not in on_path]
+    vertices = {cell: Vertex(spacing * (cell[0] + 1), spacing * (cell[1] + 1)) for cell in cells}
+
+    graph = Graph(spacing)
+    graph.bulk_load(
+        list(vertices.values()),
+        [Edge(vertices[(x, y)], vertices[(x + 1, y)]) for x, y in east.tolist()] +
+        [Edge(vertices[(x, y)], vertices[(x, y + 1)]) for x, y in south.tolist()]
+    )
+
+    return SerializedMaze(graph, [vertices[cell] for cell in path_cells], mesh_size, spacing)
+
+
+def _check_on_lattice(coords: np.ndarray, mesh_size: int, spacing: int) -> None:
+    if not coords.size:
+        return
+
+    if np.any(coords % spacing) or np.any(coords < spacing) or np.any(coords > spacing * mesh_size):
+        raise ValueError("Only vertices on the mesh lattice can be serialized.")
+
+
+def _to_mesh(vertex: Vertex, spacing: int) -> tuple[int, int]:
+    return vertex.x // spacing - 1, vertex.y // spacing - 1
+
+
+def _direction(v_from: Vertex, v_to: Vertex, spacing: int) -> tuple[int, int]:
+    from_x, from_y = _to_mesh(v_from, spacing)
+    to_x, to_y = _to_mesh(v_to, spacing)
+
+    return to_x - from_x, to_y - from_y
@@ -0,0 +1,118 @@
+import heapq
+
+from collections import defaultdict
+
+from src.generator.graph.vertex import Vertex
+
+
+class SpatialHash:
+
+    def __init__(self, cell_size: int) -> None:
+        """
+        Creates an empty uniform grid index. Queries with a radius close to the cell size only visit a 3x3 block of
+        cells, which keeps them O(1) on average regardless of the amount of indexed vertices.
+        :param cell_size: The edge length of a single grid cell.
+        """
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], list[Vertex]] = defaultdict(list)
+        self.size = 0
+
+    def cell_of(self, x: float, y: float) -> tuple[int, int]:
+        """
+        Finds the cell containing the given coordinates.
+        :param x: The x coordinate.
+        :param y: The y coordinate.
+        :return: The column and row of the cell.
+        """
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, vertex: Vertex) -> None:
+        """
+        Adds a vertex to the index.
+        :param vertex: The vertex to be added.
+        """
+        self.cells[self.cell_of(vertex.x, vertex.y)].append(vertex)
+        self.size += 1
+
+    def remove(self, vertex: Vertex) -> None:
+        """
+        Removes a vertex from the index, if it is indexed.
+        :param vertex: The vertex to be removed.
+        """
+        cell = self.cell_of(vertex.x, vertex.y)
+        bucket = self.cells.get(cell)
+
+        if bucket and vertex in bucket:
+            bucket.remove(vertex)
+            self.size -= 1
+
+            if not bucket:
+                del self.cells[cell]
+
+    def clear(self) -> None:
+        """
+        Removes all vertices from the index.
+        """
+        self.cells.clear()
+        self.size = 0
+
+    def query_radius(self, x: float, y: float, radius: float) -> list[Vertex]:
+        """
+        Finds all vertices within a radius around the given coordinates.
+        :param x: The x coordinate of the center.
+        :param y: The y coordinate of the center.
+        :param radius: The radius, vertices exactly on the boundary are included.
+        :return: The vertices within the radius, in cell order.
+        """
+        min_col, min_row = self.cell_of(x - radius, y - radius)
+        max_col, max_row = self.cell_of(x + radius, y + radius)
+        radius_squared = radius * radius
+
+        return [
+            vertex
+            for col in range(min_col, max_col + 1)
+            for row in range(min_row, max_row + 1)
+            for vertex in self.cells.get((col, row), ())
+            if (vertex.x - x) ** 2 + (vertex.y - y) ** 2 <= radius_squared
+        ]
+
+    def k_nearest(self, x: float, y: float, k: int = 1) -> list[Vertex]:
+        """
+        Finds the k vertices closest to the given coordinates by searching rings of cells around them.
+        :param x: The x coordinate.
+        :param y: The y coordinate.
+        :param k: The amount of vertices to be found.
+        :return: Up to k vertices, sorted by their distance.
+        """
+        col, row = self.cell_of(x, y)
+        candidates: list[tuple[float, int, Vertex]] = []
+        seen = 0
+        ring = 0
+
+        while seen < self.size:
+            for cell in self._ring(col, row, ring):
+                for vertex in self.cells.get(cell, ()):
+                    # the running counter breaks ties without comparing vertices
+                    candidates.append(((vertex.x - x) ** 2 + (vertex.y - y) ** 2, seen, vertex))
+                    seen += 1
+
+            # every vertex outside the searched rings is at least `ring * cell_size` away
+            bound = ring * self.cell_size
+            if len(candidates) >= k and heapq.nsmallest(k, candidates)[-1][0] <= bound * bound:
+                break
+
+            ring += 1
+
+        return [vertex for _, _, vertex in heapq.nsmallest(k, candidates)]
+
+    @staticmethod
+    def _ring(col: int, row: int, ring: int) -> list[tuple[int, int]]:
+        if ring == 0:
+            return [(col, row)]
+
+        cells = [(col + d, row - ring) for d in range(-ring, ring + 1)]
+        cells += [(col + d, row + ring) for d in range(-ring, ring + 1)]
+        cells += [(col - ring, row + d) for d in range(-ring + 1, ring)]
+        cells += [(col + ring, row + d) for d in range(-ring + 1, ring)]
+
+        return cells
@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+from src.generator.graph.edge import Edge
+from src.generator.graph.graph import Graph
+from src.generator.graph.serializer import HEADER, deserialize_maze, serialize_maze
+from src.generator.graph.vertex import Vertex
+
+
+class TestSerializer(TestCase):
+
+    def setUp(self):
+        self.spacing = 10
+        self.mesh_size = 3
+
+        # a snake through the whole 3x3 mesh, the path runs along its first five vertices
+        cells = [(0, 0), (1, 0), (2, 0), (2, 1), (1, 1), (0, 1), (0, 2), (1, 2), (2, 2)]
+        self.vertices = [Vertex(self.spacing * (x + 1), self.spacing * (y + 1)) for x, y in cells]
+
+        self.graph = Graph()
+        for v_from, v_to in zip(self.vertices, self.vertices[1:]):
+            self.graph.add_edge(Edge(v_from, v_to))
+
+        self.path = self.vertices[:5]
+
+    def test_round_trip(self):
+        maze = deserialize_maze(serialize_maze(self.graph, self.mesh_size, self.spacing, self.path))
+
+        self.assertEqual(maze.mesh_size, self.mesh_size)
+        self.assertEqual(maze.mesh_spacing, self.spacing)
+        self.assertEqual(maze.path, self.path)
+        self.assertEqual(set(maze.graph.vertices), set(self.graph.vertices))
+
+        for edge in self.graph.edges.values():
+            self.assertTrue(maze.graph.has_edge(edge))
+        self.assertEqual(len(maze.graph.edges), len(self.graph.edges))
+
+        # the path vertices lead the adjacency
+        self.assertEqual(list(maze.graph.adjacency)[:5], self.path)
+
+    def test_encoded_size(self):
+        data = serialize_maze(self.graph, self.mesh_size, self.spacing, self.path)
+
+        # 2 bits for each of the 9 cells and 2 bits for each of the 4 path steps
+        self.assertEqual(len(data), HEADER.size + 3 + 1)
+
+    def test_rejects_foreign_data(self):
+        with self.assertRaises(ValueError):
+            deserialize_maze(b"\x00" * HEADER.size)
+
+    def test_rejects_truncated_data(self):
+        data = serialize_maze(self.graph, self.mesh_size, self.spacing, self.path)
+
+        for truncated in (b"", data[:HEADER.size], data[:-1], data + b"\x00"):
+            with self.assertRaises(ValueError):
+                deserialize_maze(truncated)
+
+    def test_rejects_off_lattice_vertices(self):
+        graph = Graph()
+        graph.add_edge(Edge(Vertex(21, 20), Vertex(41, 20)))
+
+        with self.assertRaises(ValueError):
+            serialize_maze(graph, self.mesh_size, self.spacing)
+
+        with self.assertRaises(ValueError):
+            serialize_maze(self.graph, self.mesh_size, self.spacing, [Vertex(10, 10), Vertex(21, 10)])
+
+    def test_rejects_walls_leaving_the_mesh(self):
+        header = HEADER.pack(b"KMGM", 1, self.mesh_size, self.spacing, 0, 0, 0)
+
+        # east wall of cell (2, 0) in the last column, then south wall of cell (0, 2) in the last row
+        for bit in (2 * 3 * 2, 2 * 2 + 1):
+            walls = bytearray(3)
+            walls[bit // 8] |= 0x80 >> (bit % 8)
+
+            with self.assertRaises(ValueError):
+                deserialize_maze(header + bytes(walls))
+
+    def test_rejects_path_through_closed_wall(self):
+        graph = Graph()
+        graph.add_edge(Edge(self.vertices[0], self.vertices[1]))
+
+        # the path steps from (0, 0) south to (0, 1), but only the wall east of (0, 0) is open
+        path = [self.vertices[0], self.vertices[5]]
+        data = serialize_maze(graph, self.mesh_size, self.spacing, path)
+
+        with self.assertRaises(ValueError):
+            deserialize_maze(data)
@@ -0,0 +1,38 @@
+from unittest import TestCase
+
+from src.generator.graph.spatial_hash import SpatialHash
+from src.generator.graph.vertex import Vertex
+
+
+class TestSpatialHash(TestCase):
+
+    def setUp(self):
+        self.index = SpatialHash(10)
+        self.vertices = [Vertex(x * 7, y * 7) for x in range(10) for y in range(10)]
+
+        for vertex in self.vertices:
+            self.index.insert(vertex)
+
+    def test_query_radius(self):
+        for x, y, radius in [(0, 0, 7), (30, 31, 12.5), (-20, -20, 5), (35, 35, 100)]:
+            expected = {v for v in self.vertices if (v.x - x) ** 2 + (v.y - y) ** 2 <= radius ** 2}
+            self.assertEqual(set(self.index.query_radius(x, y, radius)), expected)
+
+    def test_k_nearest(self):
+        for x, y, k in [(0, 0, 1), (30, 31, 5), (200, -50, 3)]:
+            result = self.index.k_nearest(x, y, k)
+            expected = sorted(self.vertices, key=lambda v: (v.x - x) ** 2 + (v.y - y) ** 2)[:k]
+
+            self.assertEqual(
+                [(v.x - x) ** 2 + (v.y - y) ** 2 for v in result],
+                [(v.x - x) ** 2 + (v.y - y) ** 2 for v in expected]
+            )
+
+        self.assertEqual(len(self.index.k_nearest(0, 0, 1000)), len(self.vertices))
+
+    def test_remove(self):
+        self.index.remove(Vertex(0, 0))
+
+        self.assertNotIn(Vertex(0, 0), self.index.query_radius(0, 0, 7))
+        self.assertIn(self.index.k_nearest(0, 0)[0], [Vertex(7, 0), Vertex(0, 7)])
+        self.assertEqual(self.index.size, len(self.vertices) - 1)
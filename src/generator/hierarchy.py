@@ -0,0 +1,170 @@
+import random
+
+from concurrent.futures import Executor
+from itertools import repeat
+from src.generator.util.deadline import Deadline
+from src.generator.util.types import CELL
+
+NEIGHBOUR_OFFSETS: list[CELL] = [
+    (-1, 0), (1, 0),  # left and right
+    (0, -1), (0, 1)  # up and down
+]
+
+
+def random_tree_path(
+        size: int,
+        entry: CELL,
+        exit_: CELL,
+        rng: random.Random,
+        deadline: Deadline | None = None
+) -> list[CELL] | None:
+    """
+    Walks a random depth-first maze over a square lattice and returns the maze path between two cells.
+    The walk stops as soon as `exit_` is reached, at which point the history is exactly the path the full maze would
+    contain, so the remainder of the maze is never generated.
+    :param size: The amount of cells per row and column.
+    :param entry: The cell the walk starts at.
+    :param exit_: The cell the path ends at.
+    :param rng: The random generator driving the walk.
+    :param deadline: Checked for cancellation on every step, the walk is given up once it expires.
+    :return: The cells of the path from `entry` to `exit_`, or None if the deadline expired first.
+    """
+    visited = {entry}
+    history = [entry]
+
+    while history[-1] != exit_:
+        if deadline:
+            deadline.check()
+            if deadline.expired():
+                return None
+
+        x, y = history[-1]
+
+        neighbours = [
+            (x + dx, y + dy)
+            for dx, dy in NEIGHBOUR_OFFSETS
+            if 0 <= x + dx < size and 0 <= y + dy < size and (x + dx, y + dy) not in visited
+        ]
+
+        if neighbours:
+            next_cell = rng.choice(neighbours)
+            visited.add(next_cell)
+            history.append(next_cell)
+        else:
+            history.pop()
+
+    return history
+
+
+def straight_path(entry: CELL, exit_: CELL) -> list[CELL]:
+    """
+    Connects two cells with a horizontal and then a vertical straight run, the cheapest fallback of a walk.
+    :param entry: The cell the path starts at.
+    :param exit_: The cell the path ends at.
+    :return: The cells of the path from `entry` to `exit_`.
+    """
+    (entry_x, entry_y), (exit_x, exit_y) = entry, exit_
+    step_x = 1 if exit_x >= entry_x else -1
+    step_y = 1 if exit_y >= entry_y else -1
+
+    return ([(x, entry_y) for x in range(entry_x, exit_x, step_x)] +
+            [(exit_x, y) for y in range(entry_y, exit_y + step_y, step_y)])
+
+
+def refine_cell(
+        origin: CELL,
+        factor: int,
+        entry: CELL,
+        exit_: CELL,
+        seed: int,
+        deadline: Deadline | None = None
+) -> tuple[list[CELL], bool]:
+    """
+    Generates the sub-maze path of a single coarse cell. Only depends on its arguments, so cells can be refined in
+    separate threads or processes. A deadline passed to another process no longer sees cancellation, only expiry.
+    :param origin: The mesh position of the coarse cell's top left vertex.
+    :param factor: The amount of mesh vertices per row and column of the coarse cell.
+    :param entry: The position the path enters the cell at, relative to `origin`.
+    :param exit_: The position the path leaves the cell at, relative to `origin`.
+    :param seed: The seed of the cell's random generator.
+    :param deadline: The deadline of the walk, a straight path is used once it expires.
+    :return: The mesh positions of the path through the cell, and whether the straight fallback was used.
+    """
+    path = random_tree_path(factor, entry, exit_, random.Random(seed), deadline)
+    straight = path is None
+
+    if straight:
+        path = straight_path(entry, exit_)
+
+    return [(origin[0] + x, origin[1] + y) for x, y in path], straight
+
+
+def hierarchical_path(
+        mesh_size: int,
+        factor: int,
+        start: CELL,
+        finish: CELL,
+        rng: random.Random,
+        executor: Executor | None = None,
+        deadline: Deadline | None = None
+) -> tuple[list[CELL], bool]:
+    """
+    Generates a path from start to finish by first finding a path through a coarse maze, whose cells are
+    `factor` x `factor` blocks of the mesh, and then refining only the coarse cells along that path.
+    :param mesh_size: The amount of mesh vertices per row and column, must be divisible by `factor`.
+    :param factor: The amount of mesh vertices per row and column of a coarse cell.
+    :param start: The mesh position of the start.
+    :param finish: The mesh position of the finish.
+    :param rng: The random generator of the coarse maze, which also seeds the refined cells.
+    :param executor: Refines the cells in parallel if given, otherwise they are refined sequentially.
+    :param deadline: Checked within the walks and between refined cells, walks fall back to straight paths once it
+        expires.
+    :return: The mesh positions of the path from start to finish, and whether any straight fallback was used.
+    """
+    if factor <= 0:
+        raise ValueError("The refinement factor must be positive.")
+
+    if mesh_size % factor:
+        raise ValueError("The mesh size must be divisible by the refinement factor.")
+
+    coarse_start = (start[0] // factor, start[1] // factor)
+    coarse_finish = (finish[0] // factor, finish[1] // factor)
+    coarse_path = random_tree_path(mesh_size // factor, coarse_start, coarse_finish, rng, deadline)
+    straight = coarse_path is None
+
+    if straight:
+        coarse_path = straight_path(coarse_start, coarse_finish)
+
+    # the coarse path fixes where the fine path crosses from one cell into the next
+    entries = [(start[0] % factor, start[1] % factor)]
+    exits = []
+
+    for (from_x, from_y), (to_x, to_y) in zip(coarse_path, coarse_path[1:]):
+        offset = rng.randrange(factor)
+        dx, dy = to_x - from_x, to_y - from_y
+
+        if dx:
+            exits.append((factor - 1 if dx > 0 else 0, offset))
+            entries.append((0 if dx > 0 else factor - 1, offset))
+        else:
+            exits.append((offset, factor - 1 if dy > 0 else 0))
+            entries.append((offset, 0 if dy > 0 else factor - 1))
+
+    exits.append((finish[0] % factor, finish[1] % factor))
+
+    origins = [(x * factor, y * factor) for x, y in coarse_path]
+    seeds = [rng.getrandbits(64) for _ in coarse_path]
+
+    refined = (executor.map if executor else map)(
+        refine_cell, origins, repeat(factor), entries, exits, seeds, repeat(deadline)
+    )
+
+    cells = []
+    for path, straight_cell in refined:
+        if deadline:
+            deadline.check()
+
+        cells += path
+        straight = straight or straight_cell
+
+    return cells, straight
@@ -22,6 +22,16 @@ class Map:
 
         self.grid = grid
 
+    def reset(self) -> None:
+        self.fill_grid(BlockType.HOOKABLE)
+
+    def fill_grid(self, block_type: BlockType) -> None:
+        # refills the existing rows in place instead of allocating a new grid
+        row = [block_type] * self.grid_size
+
+        for grid_row in self.grid:
+            grid_row[:] = row
+
     def get_padded_np_array(self):
         border_width = self.preset.border_width
 
@@ -47,8 +57,22 @@ class Map:
 
         return padded_array
 
-    def save_image(self) -> None:
+    def get_grid_values(self) -> np.ndarray:
+        return np.array([[block.value for block in row] for row in self.grid], dtype=np.int16)
+
+    def set_grid_values(self, values: np.ndarray) -> None:
+        if values.shape != (self.grid_size, self.grid_size):
+            raise ValueError(f"Grid values of shape {values.shape} do not fit a grid of size {self.grid_size}.")
+
+        # decode every row first, so an unknown block value leaves the grid untouched
+        rows = [list(map(BlockType, row)) for row in values.tolist()]
+
+        for grid_row, row in zip(self.grid, rows):
+            grid_row[:] = row
+
+    def get_image(self) -> Image.Image:
+        return Image.fromarray(self.get_padded_np_array())
+
+    def save_image(self, path: str = "map.png") -> None:
         if self.grid:
-            arr = self.get_padded_np_array()
-            image = Image.fromarray(arr)
-            image.save("map.png")
+            self.get_image().save(path)
@@ -24,3 +24,36 @@ class TestMap(TestCase):
         for row in self.map.grid:
             for block in row:
                 self.assertEqual(block, BlockType.HOOKABLE)
+
+    def test_reset(self):
+        rows = list(self.map.grid)
+        self.map.grid[3][4] = BlockType.EMPTY
+
+        self.map.reset()
+
+        # the rows are refilled in place
+        self.assertTrue(all(a is b for a, b in zip(rows, self.map.grid)))
+        self.assertEqual(self.map.grid[3][4], BlockType.HOOKABLE)
+
+    def test_set_grid_values(self):
+        values = self.map.get_grid_values()
+        values[3][4] = BlockType.EMPTY.value
+
+        self.map.set_grid_values(values)
+        self.assertEqual(self.map.grid[3][4], BlockType.EMPTY)
+
+        with self.assertRaises(ValueError):
+            self.map.set_grid_values(values[:-1])
+
+    def test_set_grid_values_unknown_block(self):
+        values = self.map.get_grid_values()
+        values[:] = BlockType.FLOOD.value
+        values[-1][-1] = 12345
+
+        with self.assertRaises(ValueError):
+            self.map.set_grid_values(values)
+
+        # the grid is left untouched
+        for row in self.map.grid:
+            for block in row:
+                self.assertEqual(block, BlockType.HOOKABLE)
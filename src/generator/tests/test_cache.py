@@ -0,0 +1,122 @@
+import os
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from src.generator.cache import MapCache, generate_cached
+from src.generator.generator import Generator
+from src.generator.map.map import Map
+from src.generator.util.blocks import BlockType
+from src.generator.util.presets import SimplePreset
+
+
+class TestMapCache(TestCase):
+
+    def setUp(self):
+        self.preset = SimplePreset(
+            border_width=5,
+            mesh_size=3,
+            mesh_spacing=10,
+            start=(0, 0),
+            finish=(2, 2)
+        )
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = MapCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_key(self):
+        key = self.cache.key(self.preset, 1, {"spline_samples": 5})
+
+        self.assertEqual(key, self.cache.key(self.preset, 1, {"spline_samples": 5}))
+        self.assertNotEqual(key, self.cache.key(self.preset, 2, {"spline_samples": 5}))
+        self.assertNotEqual(key, self.cache.key(self.preset, 1, {"spline_samples": 4}))
+
+    def test_generate_cached(self):
+        generated_map, generated_image = generate_cached(self.preset, 7, self.cache)
+        cached_map, cached_image = generate_cached(self.preset, 7, self.cache)
+
+        self.assertEqual(generated_map.grid, cached_map.grid)
+        self.assertEqual(generated_image, cached_image)
+        self.assertEqual(len(os.listdir(self.directory.name)), 1)
+
+    def test_evict(self):
+        generate_cached(self.preset, 1, self.cache)
+        size = os.path.getsize(os.path.join(self.directory.name, os.listdir(self.directory.name)[0]))
+
+        self.cache.max_bytes = size * 3 // 2
+        generate_cached(self.preset, 2, self.cache)
+
+        self.assertEqual(len(os.listdir(self.directory.name)), 1)
+
+    def test_evict_stale_temporary_files(self):
+        stale = os.path.join(self.directory.name, ".stale.tmp")
+        pending = os.path.join(self.directory.name, ".pending.tmp")
+
+        for path in (stale, pending):
+            with open(path, "wb") as file:
+                file.write(b"\x00" * 100)
+
+        os.utime(stale, (0, 0))
+        self.cache.max_bytes = 50
+
+        self.cache.evict()
+
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(pending))
+
+    def test_damaged_entry_is_a_miss(self):
+        generate_cached(self.preset, 1, self.cache)
+        path = os.path.join(self.directory.name, os.listdir(self.directory.name)[0])
+
+        with open(path, "wb") as file:
+            file.write(b"damaged")
+
+        generated_map, _ = generate_cached(self.preset, 1, self.cache)
+
+        self.assertEqual(generated_map.grid, generate_cached(self.preset, 1, self.cache)[0].grid)
+        self.assertGreater(os.path.getsize(path), len(b"damaged"))
+
+    def test_generate_cached_reuses_generator(self):
+        generator = Generator(Map(self.preset))
+
+        reused_map, _ = generate_cached(self.preset, 3, self.cache, generator)
+        self.assertIs(reused_map, generator.map)
+
+        other_preset = SimplePreset(
+            border_width=5,
+            mesh_size=4,
+            mesh_spacing=10,
+            start=(0, 0),
+            finish=(3, 3)
+        )
+        with self.assertRaises(ValueError):
+            generate_cached(other_preset, 3, self.cache, generator)
+
+    def test_transient_error_keeps_entry(self):
+        generate_cached(self.preset, 1, self.cache)
+        path = os.path.join(self.directory.name, os.listdir(self.directory.name)[0])
+        key = os.path.basename(path)[:-len(".npz")]
+
+        with patch("src.generator.cache.np.load", side_effect=PermissionError):
+            self.assertIsNone(self.cache.load(key, Map(self.preset)))
+
+        self.assertTrue(os.path.exists(path))
+
+    def test_entry_with_unknown_block(self):
+        generated_map, _ = generate_cached(self.preset, 1, self.cache)
+        key = os.listdir(self.directory.name)[0][:-len(".npz")]
+
+        values = generated_map.get_grid_values()
+        values[:] = BlockType.FLOOD.value
+        values[-1][-1] = 12345
+        with open(self.cache.path_of(key), "wb") as file:
+            np.savez_compressed(file, grid=values, image=np.zeros(1, dtype=np.uint8))
+
+        regenerated_map, _ = generate_cached(self.preset, 1, self.cache)
+
+        self.assertEqual(regenerated_map.grid, generated_map.grid)
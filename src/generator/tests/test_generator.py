@@ -1,8 +1,12 @@
 from unittest import TestCase
+from unittest.mock import patch
 
 from src.generator.generator import Generator
 from src.generator.graph.graph import Graph
+from src.generator.graph.vertex import Vertex
 from src.generator.map.map import Map
+from src.generator.util.blocks import BlockType
+from src.generator.util.deadline import Deadline, Degradation, GenerationCancelled
 from src.generator.util.presets import SimplePreset
 
 
@@ -47,4 +51,244 @@ class TestGenerator(TestCase):
         for v in res:
             self.assertIn(v, self.gen.graph.vertices.values())
 
+    def test_jittered_mesh(self):
+        for jitter, seed in [(4, 1), (4, 2), (9, 3), (9, 4)]:
+            preset = SimplePreset(
+                border_width=5,
+                mesh_size=6,
+                mesh_spacing=20,
+                start=(0, 0),
+                finish=(5, 5),
+                jitter=jitter
+            )
+            gen = Generator(Map(preset), seed=seed)
+            gen.graph = Graph(preset.mesh_spacing)
+            gen.create_vertex_mesh()
+            gen.connect_graph_random()
 
+            # the walk reaches every vertex, so the edges form a spanning tree
+            self.assertTrue(gen.graph.all_visited(True))
+            self.assertEqual(len(gen.graph.edges), len(gen.graph.vertices) - 1)
+            self.assertIsNotNone(gen.get_vertex_at(*preset.finish))
+
+            edges = list(gen.graph.edges.values())
+
+            # every edge joins lattice neighbours
+            for edge in edges:
+                from_x, from_y = gen.get_lattice_position(edge.v_from)
+                to_x, to_y = gen.get_lattice_position(edge.v_to)
+                self.assertEqual(abs(to_x - from_x) + abs(to_y - from_y), preset.mesh_spacing)
+
+            # no two edges cross
+            for i, a in enumerate(edges):
+                for b in edges[i + 1:]:
+                    if {a.v_from, a.v_to} & {b.v_from, b.v_to}:
+                        continue
+                    self.assertFalse(self.segments_intersect(a, b), (a, b))
+
+    def test_jitter_validation(self):
+        with self.assertRaises(ValueError):
+            SimplePreset(5, 3, 20, (0, 0), (2, 2), jitter=10)
+
+        with self.assertRaises(ValueError):
+            SimplePreset(5, 3, 20, (0, 0), (2, 2), jitter=-1)
+
+    @staticmethod
+    def segments_intersect(a, b) -> bool:
+        def orientation(p, q, r):
+            value = (q.x - p.x) * (r.y - p.y) - (q.y - p.y) * (r.x - p.x)
+            return (value > 0) - (value < 0)
+
+        def on_segment(p, q, r):
+            return min(p.x, q.x) <= r.x <= max(p.x, q.x) and min(p.y, q.y) <= r.y <= max(p.y, q.y)
+
+        p1, q1, p2, q2 = a.v_from, a.v_to, b.v_from, b.v_to
+        o1, o2 = orientation(p1, q1, p2), orientation(p1, q1, q2)
+        o3, o4 = orientation(p2, q2, p1), orientation(p2, q2, q1)
+
+        if o1 != o2 and o3 != o4:
+            return True
+
+        return any(
+            o == 0 and on_segment(p, q, r)
+            for o, p, q, r in ((o1, p1, q1, p2), (o2, p1, q1, q2), (o3, p2, q2, p1), (o4, p2, q2, q1))
+        )
+
+    def test_generate_hierarchical(self):
+        preset = SimplePreset(
+            border_width=5,
+            mesh_size=8,
+            mesh_spacing=20,
+            start=(0, 0),
+            finish=(7, 7)
+        )
+        gen = Generator(Map(preset), seed=2)
+        gen.generate_hierarchical(4)
+
+        vertices = gen.get_path_vertices()
+
+        self.assertEqual(vertices[0], gen.get_vertex_at(*preset.start))
+        self.assertEqual(vertices[-1], gen.get_vertex_at(*preset.finish))
+        self.assertEqual(len(gen.graph.edges), len(vertices) - 1)
+
+    def test_generate_hierarchical_jittered(self):
+        preset = SimplePreset(
+            border_width=5,
+            mesh_size=8,
+            mesh_spacing=20,
+            start=(0, 0),
+            finish=(7, 7),
+            jitter=5
+        )
+        gen = Generator(Map(preset), seed=2)
+        gen.generate_hierarchical(4)
+
+        vertices = gen.get_path_vertices()
+
+        self.assertEqual(vertices[-1], gen.get_vertex_at(*preset.finish))
+        self.assertTrue(any(gen.get_lattice_position(v) != (v.x, v.y) for v in vertices))
+
+        for v_from, v_to in zip(vertices, vertices[1:]):
+            from_x, from_y = gen.get_lattice_position(v_from)
+            to_x, to_y = gen.get_lattice_position(v_to)
+            self.assertEqual(abs(to_x - from_x) + abs(to_y - from_y), preset.mesh_spacing)
+
+    def test_reset(self):
+        preset = SimplePreset(
+            border_width=5,
+            mesh_size=6,
+            mesh_spacing=20,
+            start=(0, 0),
+            finish=(5, 5)
+        )
+        gen = Generator(Map(preset), seed=1)
+        gen.generate_from_graph()
+        mesh = list(gen.mesh)
+
+        gen.reset(seed=2)
+        gen.generate_from_graph()
+
+        fresh_map = Map(preset)
+        Generator(fresh_map, seed=2).generate_from_graph()
+
+        self.assertEqual(gen.map.grid, fresh_map.grid)
+        self.assertTrue(all(a is b for a, b in zip(mesh, gen.mesh)))
+
+    def test_generate_without_deadline(self):
+        preset = SimplePreset(
+            border_width=5,
+            mesh_size=6,
+            mesh_spacing=20,
+            start=(0, 0),
+            finish=(5, 5)
+        )
+
+        self.assertEqual(Generator(Map(preset), seed=1).generate_from_graph(Deadline(60)), [])
+
+    def test_generate_past_deadline(self):
+        preset = SimplePreset(
+            border_width=5,
+            mesh_size=6,
+            mesh_spacing=20,
+            start=(0, 0),
+            finish=(5, 5)
+        )
+        gen = Generator(Map(preset), seed=1)
+
+        degradations = gen.generate_from_graph(Deadline(0))
+
+        # the walk never reaches the finish, so it is connected straight away
+        self.assertIn(Degradation.STRAIGHT_WALK, degradations)
+        self.assertIn(Degradation.STRAIGHT_EDGES, degradations)
+
+        # start and finish are still connected by a painted path
+        for x, y in (preset.start, preset.finish):
+            vertex_x, vertex_y = gen.get_vertex_position(x, y)
+            self.assertEqual(gen.map.grid[vertex_y][vertex_x], BlockType.EMPTY)
+
+    def test_connect_graph_random_expires_before_finish(self):
+        preset = SimplePreset(
+            border_width=5,
+            mesh_size=6,
+            mesh_spacing=20,
+            start=(0, 0),
+            finish=(5, 5)
+        )
+        gen = Generator(Map(preset), seed=1)
+        gen.deadline = Deadline()
+        gen.create_vertex_mesh()
+
+        # the deadline expires a few steps into the walk
+        with patch.object(gen.deadline, "expired", side_effect=[False] * 3 + [True] * 100):
+            gen.connect_graph_random()
+
+        self.assertEqual(gen.degradations, [Degradation.STRAIGHT_WALK])
+
+        gen.find_path()
+        vertices = gen.get_path_vertices()
+
+        self.assertEqual(vertices[0], gen.get_vertex_at(*preset.start))
+        self.assertEqual(vertices[-1], gen.get_vertex_at(*preset.finish))
+
+    def test_generate_cancelled(self):
+        deadline = Deadline()
+        deadline.cancel()
+
+        with self.assertRaises(GenerationCancelled):
+            Generator(self.map, seed=1).generate_from_graph(deadline)
+
+    def test_generate_hierarchical_past_deadline(self):
+        preset = SimplePreset(
+            border_width=5,
+            mesh_size=8,
+            mesh_spacing=20,
+            start=(0, 0),
+            finish=(7, 7)
+        )
+        gen = Generator(Map(preset), seed=2)
+
+        degradations = gen.generate_hierarchical(4, deadline=Deadline(0))
+
+        self.assertIn(Degradation.STRAIGHT_WALK, degradations)
+        self.assertEqual(gen.get_path_vertices()[-1], gen.get_vertex_at(*preset.finish))
+
+    def test_load_maze(self):
+        preset = SimplePreset(
+            border_width=5,
+            mesh_size=6,
+            mesh_spacing=20,
+            start=(0, 0),
+            finish=(5, 5)
+        )
+        gen = Generator(Map(preset), seed=1)
+        gen.generate_from_graph()
+        data = gen.serialize_maze()
+
+        loaded = Generator(Map(preset))
+        loaded.load_maze(data)
+        self.assertEqual(loaded.get_path_vertices(), gen.get_path_vertices())
+
+        with self.assertRaises(ValueError):
+            Generator(self.map).load_maze(data)
+
+    def test_generate_jittered(self):
+        preset = SimplePreset(
+            border_width=5,
+            mesh_size=6,
+            mesh_spacing=10,
+            start=(0, 0),
+            finish=(5, 5),
+            jitter=4
+        )
+
+        # the brush reaches the edges of the grid for some seeds
+        for seed in range(40):
+            Generator(Map(preset), seed=seed).generate_from_graph()
+            Generator(Map(preset), seed=seed).generate_hierarchical(3)
+
+    def test_paint_connected_vertices_clipped(self):
+        gen = Generator(self.map)
+        gen.paint_connected_vertices([Vertex(0, 0), Vertex(0, 1)], [2, 2])
+
+        self.assertEqual(self.map.grid[0][0], BlockType.EMPTY)
+        self.assertEqual(self.map.grid[-1][-1], BlockType.HOOKABLE)
@@ -0,0 +1,69 @@
+import random
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import TestCase
+
+from src.generator.hierarchy import hierarchical_path, random_tree_path, straight_path
+from src.generator.util.deadline import Deadline, GenerationCancelled
+
+
+class TestHierarchy(TestCase):
+
+    def assertContinuousPath(self, path, start, finish):
+        self.assertEqual(path[0], start)
+        self.assertEqual(path[-1], finish)
+        self.assertEqual(len(set(path)), len(path))
+
+        for (from_x, from_y), (to_x, to_y) in zip(path, path[1:]):
+            self.assertEqual(abs(to_x - from_x) + abs(to_y - from_y), 1)
+
+    def test_random_tree_path(self):
+        path = random_tree_path(5, (0, 0), (4, 4), random.Random(1))
+
+        self.assertContinuousPath(path, (0, 0), (4, 4))
+        self.assertEqual(random_tree_path(5, (2, 2), (2, 2), random.Random(1)), [(2, 2)])
+
+    def test_hierarchical_path(self):
+        path, straight = hierarchical_path(12, 4, (0, 0), (11, 11), random.Random(3))
+
+        self.assertFalse(straight)
+        self.assertContinuousPath(path, (0, 0), (11, 11))
+        self.assertTrue(all(0 <= x < 12 and 0 <= y < 12 for x, y in path))
+
+    def test_hierarchical_path_parallel(self):
+        sequential = hierarchical_path(12, 4, (5, 1), (6, 10), random.Random(3))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            parallel = hierarchical_path(12, 4, (5, 1), (6, 10), random.Random(3), executor)
+
+        self.assertEqual(sequential, parallel)
+
+    def test_hierarchical_path_processes(self):
+        sequential = hierarchical_path(12, 4, (5, 1), (6, 10), random.Random(3), deadline=Deadline(60))
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            parallel = hierarchical_path(12, 4, (5, 1), (6, 10), random.Random(3), executor, Deadline(60))
+
+        self.assertEqual(sequential, parallel)
+
+    def test_straight_path(self):
+        for entry, exit_ in [((0, 0), (3, 2)), ((3, 2), (0, 0)), ((1, 1), (1, 1)), ((2, 0), (2, 3))]:
+            self.assertContinuousPath(straight_path(entry, exit_), entry, exit_)
+
+    def test_hierarchical_path_past_deadline(self):
+        path, straight = hierarchical_path(12, 4, (0, 0), (11, 11), random.Random(3), deadline=Deadline(0))
+
+        self.assertTrue(straight)
+        self.assertContinuousPath(path, (0, 0), (11, 11))
+
+    def test_hierarchical_path_cancelled(self):
+        deadline = Deadline()
+        deadline.cancel()
+
+        with self.assertRaises(GenerationCancelled):
+            hierarchical_path(12, 4, (0, 0), (11, 11), random.Random(3), deadline=deadline)
+
+    def test_invalid_factor(self):
+        for factor in (4, 0, -2):
+            with self.assertRaises(ValueError):
+                hierarchical_path(10, factor, (0, 0), (9, 9), random.Random(3))
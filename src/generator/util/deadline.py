@@ -0,0 +1,65 @@
+import math
+import time
+
+from enum import Enum
+
+
+class GenerationCancelled(Exception):
+    pass
+
+
+class Degradation(Enum):
+    TRUNCATED_WALK = "truncated_walk"
+    STRAIGHT_WALK = "straight_walk"
+    REDUCED_SPLINE_SAMPLES = "reduced_spline_samples"
+    NO_PERLIN = "no_perlin"
+    STRAIGHT_EDGES = "straight_edges"
+    NARROW_BRUSH = "narrow_brush"
+
+
+class Deadline:
+
+    def __init__(self, seconds: float | None = None) -> None:
+        """
+        Creates a time budget that starts immediately, which doubles as a cancellation token.
+        :param seconds: The time budget in seconds, or None if only cancellation is needed.
+        """
+        self.seconds = seconds
+        self.start = time.perf_counter()
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """
+        Requests cancellation, which is raised by the next `check`. Safe to call from another thread.
+        """
+        self.cancelled = True
+
+    def check(self) -> None:
+        """
+        Raises if cancellation was requested. An expired deadline does not raise, it only leads to degradations.
+        """
+        if self.cancelled:
+            raise GenerationCancelled("Generation was cancelled.")
+
+    def remaining(self) -> float:
+        """
+        Calculates the time left until the deadline.
+        :return: The remaining seconds, 0 once expired, or infinity if there is no time budget.
+        """
+        if self.seconds is None:
+            return math.inf
+
+        return max(0.0, self.start + self.seconds - time.perf_counter())
+
+    def fraction_remaining(self) -> float:
+        """
+        Calculates the share of the time budget that is left.
+        :return: A value between 0 and 1, always 1 if there is no time budget.
+        """
+        if self.seconds is None:
+            return 1.0
+
+        return self.remaining() / self.seconds if self.seconds > 0 else 0.0
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
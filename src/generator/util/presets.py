@@ -22,3 +22,9 @@ class SimplePreset:
     mesh_spacing: int
     start: tuple[int, int]
     finish: tuple[int, int]
+    # maximum random offset of every mesh vertex along each axis
+    jitter: int = 0
+
+    def __post_init__(self):
+        if not 0 <= 2 * self.jitter < self.mesh_spacing:
+            raise ValueError("The jitter must be at least 0 and below half the mesh spacing.")
@@ -1,3 +1,5 @@
 from src.generator.util.blocks import BlockType
 
 type GRID = list[list[BlockType]]
+
+type CELL = tuple[int, int]
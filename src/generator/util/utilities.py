@@ -36,8 +36,14 @@ def bresenham_line(start_vertex: Vertex, end_vertex: Vertex) -> list[tuple[int,
     return points
 
 
-def generate_widths(amount: int, base_width: int = 4, variation: int = 3, frequency: float = 0.1) -> list[int]:
-    offset = random.randint(0, 1000)  # random offset for perlin noise
+def generate_widths(
+        amount: int,
+        base_width: int = 4,
+        variation: int = 3,
+        frequency: float = 0.1,
+        rng: random.Random | None = None
+) -> list[int]:
+    offset = (rng or random).randint(0, 1000)  # random offset for perlin noise
 
     widths = [
         base_width + int(pnoise1((i + offset) * frequency) * variation)